@@ -3,56 +3,79 @@ import json
 import platform
 import socket
 import sys
-from collections.abc import Iterable
 import os
 import importlib
 import inspect
 import types
 import pickle
 import base64
-import re
+import string
 import subprocess
 import io
 import threading
 import time
-import signal
 import warnings
+import atexit
+import weakref
 try:
-    import line_profiler
+    import orjson
 except ImportError:
-    line_profiler = None
-try:
-    import psutil
-except ImportError:
-    psutil = None
-try:
-    import conda
-    import conda.testing.conda_cli
-except ImportError:
-    conda = None
-try:
-    import numpy
-except ImportError:
-    numpy = None
-try:
-    import pandas
-except ImportError:
-    pandas = None
+    orjson = None
 
 
 from . import _version
 __version__ = _version.get_versions()['version']
 
 
+def _import_optional(name):
+    """ Import an optional dependency on first use, or return None
+
+    Optional dependencies are imported lazily, so that importing microbench
+    stays fast for users who don't need them.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+# Encoders for common types, looked up by exact type in JSONEncoder.default.
+# numpy types are added once numpy has been imported.
+_JSON_DEFAULT_DISPATCH = {
+    datetime: datetime.isoformat,
+    timedelta: timedelta.total_seconds,
+    timezone: str,
+}
+
+
+def _add_numpy_json_dispatch(numpy):
+    _JSON_DEFAULT_DISPATCH.update({
+        numpy.int64: int,
+        numpy.int32: int,
+        numpy.float64: float,
+        numpy.float32: float,
+        numpy.ndarray: numpy.ndarray.tolist,
+    })
+
+
 class JSONEncoder(json.JSONEncoder):
     def default(self, o):
+        encode = _JSON_DEFAULT_DISPATCH.get(type(o))
+        if encode is not None:
+            return encode(o)
+
+        # Fall back to isinstance checks, for subclasses and other types
         if isinstance(o, datetime):
             return o.isoformat()
         if isinstance(o, timedelta):
             return o.total_seconds()
         if isinstance(o, timezone):
             return str(o)
+        # Objects can only be numpy types if numpy has already been imported
+        numpy = sys.modules.get('numpy')
         if numpy:
+            if numpy.ndarray not in _JSON_DEFAULT_DISPATCH:
+                _add_numpy_json_dispatch(numpy)
             if isinstance(o, numpy.integer):
                 return int(o)
             elif isinstance(o, numpy.floating):
@@ -70,8 +93,45 @@ class JSONEncodeWarning(Warning):
 
 _UNENCODABLE_PLACEHOLDER_VALUE = '__unencodable_as_json__'
 
+# Types accepted for env_vars and capture_versions. A plain str is iterable,
+# so an Iterable check would accept env_vars = ('HOME') by mistake.
+_COLLECTION_TYPES = (list, tuple, set, frozenset)
+
+
+# MicroBench instances, so buffered results can be discarded in forked child
+# processes. Otherwise, the child would write the parent's results again.
+_instances = weakref.WeakSet()
+
+
+def _discard_output_buffers():
+    for bench in _instances:
+        bench._output_buffer = []
+        bench._output_buffer_records = 0
+        # The lock may have been held by another thread at the time of fork
+        bench._output_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_discard_output_buffers)
+
+
+class _BMData(dict):
+    """ Benchmark data, with per-call context stored as attributes
+
+    Only the dict contents are output; the attributes hold the benchmarked
+    function, its arguments, and timer state.
+    """
+    __slots__ = ('func', 'args', 'kwargs', 'run_start', 'start_counter')
+
+
+if orjson:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
 
 class MicroBench(object):
+    # Package versions, keyed by id() of the package's module
+    _pkg_version_cache = {}
+
     def __init__(self, outfile=None, json_encoder=JSONEncoder,
                  tz=timezone.utc, iterations=1,
                  duration_counter=time.perf_counter,
@@ -83,7 +143,10 @@ class MicroBench(object):
                 Defaults to None, which captures data using a StringIO
                 buffer.
             json_encoder (json.JSONEncoder, optional): JSONEncoder for
-                benchmark results. Defaults to JSONEncoder.
+                benchmark results. Defaults to JSONEncoder. When orjson is
+                installed, it is used instead of the default JSONEncoder,
+                apart from values orjson rejects, such as integers over 64
+                bits. A custom JSONEncoder is always used in full.
             tz (timezone, optional): Timezone for start_time and finish_time.
                 Defaults to timezone.utc.
             iterations (int, optional): Number of iterations to run function.
@@ -92,20 +155,87 @@ class MicroBench(object):
                 run_durations. Defaults to time.perf_counter.
 
         Raises:
-            ValueError: If unknown position arguments are used.
+            ValueError: If unknown position arguments are used, or if
+                env_vars or capture_versions are not a list, tuple or set.
         """
         if args:
             raise ValueError('Only keyword arguments are allowed')
-        self._bm_static = kwargs
+        # Underscore-prefixed keys are never output, so drop them up front
+        self._bm_static = {k: v for k, v in kwargs.items()
+                           if not k.startswith('_')}
         if outfile is not None:
             self.outfile = outfile
         elif not hasattr(self, 'outfile'):
             self.outfile = io.StringIO()
         self._json_encoder = json_encoder
+        # Create the encoder once, with compact separators to match orjson.
+        # orjson encodes types like datetime natively, bypassing default(),
+        # so it's only used with the default encoder, not custom ones.
+        self._encoder = json_encoder(separators=(',', ':'))
+        self._orjson = orjson if json_encoder is JSONEncoder else None
+        self._json_default = self._encoder.default
+        # Subclasses may override to_json, which must then be used for all
+        # output
+        self._to_json_overridden = \
+            type(self).to_json is not MicroBench.to_json
         self._duration_counter = duration_counter
         self.tz = tz
         self.iterations = iterations
 
+        # Output file handle and buffer, used when outfile is a path
+        self._outfile_handle = None
+        self._output_buffer = []
+        self._output_buffer_records = 0
+        self._output_lock = threading.Lock()
+        self._flush_registered = False
+        _instances.add(self)
+
+        # Validate env_vars and capture_versions once, rather than per call
+        self._env_snapshot = {}
+        if hasattr(self, 'env_vars'):
+            if not isinstance(self.env_vars, _COLLECTION_TYPES):
+                raise ValueError('env_vars should be a tuple of environment '
+                                 'variable names')
+            # Environment variables are read once, here, as decoding
+            # os.environ entries on every call is wasted work
+            self._env_snapshot = {'env_{}'.format(env_var):
+                                  os.environ.get(env_var)
+                                  for env_var in self.env_vars}
+
+        self._capture_versions = None
+        if hasattr(self, 'capture_versions'):
+            if not isinstance(self.capture_versions, _COLLECTION_TYPES):
+                raise ValueError('capture_versions is reserved for a tuple of '
+                                 'package names - please rename this method')
+            # Package versions don't change within a process, so read them
+            # once here
+            self._capture_versions = {
+                pkg.__name__: getattr(pkg, '__version__', None)
+                for pkg in self.capture_versions}
+
+        # Bind capture methods once, rather than scanning dir(self) on
+        # every call
+        self._capture_methods = tuple(
+            getattr(self, name)
+            for name in self._get_capture_method_names('capture_'))
+        self._capturepost_methods = tuple(
+            getattr(self, name)
+            for name in self._get_capture_method_names('capturepost_'))
+
+    @classmethod
+    def _get_capture_method_names(cls, prefix):
+        """ Names of callable attributes starting with prefix, cached per class """
+        cache = cls.__dict__.get('_capture_method_names_cache')
+        if cache is None:
+            cache = {}
+            cls._capture_method_names_cache = cache
+        names = cache.get(prefix)
+        if names is None:
+            names = cache[prefix] = tuple(
+                name for name in dir(cls)
+                if name.startswith(prefix) and callable(getattr(cls, name)))
+        return names
+
     def pre_start_triggers(self, bm_data):
         # Store timezone
         bm_data['timestamp_tz'] = str(self.tz)
@@ -113,29 +243,16 @@ class MicroBench(object):
         bm_data['duration_counter'] = self._duration_counter.__name__
 
         # Capture environment variables
-        if hasattr(self, 'env_vars'):
-            if not isinstance(self.env_vars, Iterable):
-                raise ValueError('env_vars should be a tuple of environment '
-                                 'variable names')
-
-            for env_var in self.env_vars:
-                bm_data['env_{}'.format(env_var)] = os.environ.get(env_var)
+        bm_data.update(self._env_snapshot)
 
         # Capture package versions
-        if hasattr(self, 'capture_versions'):
-            if not isinstance(self.capture_versions, Iterable):
-                raise ValueError('capture_versions is reserved for a tuple of'
-                                 'package names - please rename this method')
-
-            for pkg in self.capture_versions:
-                self._capture_package_version(bm_data, pkg)
+        if self._capture_versions:
+            bm_data.setdefault('package_versions', {}).update(
+                self._capture_versions)
 
         # Run capture triggers
-        for method_name in dir(self):
-            if method_name.startswith('capture_'):
-                method = getattr(self, method_name)
-                if callable(method):
-                    method(bm_data)
+        for method in self._capture_methods:
+            method(bm_data)
 
         # Initialise telemetry thread
         if hasattr(self, 'telemetry'):
@@ -147,9 +264,20 @@ class MicroBench(object):
 
         bm_data['run_durations'] = []
         bm_data['start_time'] = datetime.now(self.tz)
+        bm_data.start_counter = time.perf_counter_ns()
 
     def post_finish_triggers(self, bm_data):
-        bm_data['finish_time'] = datetime.now(self.tz)
+        # Derive finish_time from a monotonic clock, which saves a second
+        # wall clock read and is unaffected by system clock adjustments.
+        # perf_counter is used over monotonic for its higher resolution on
+        # some platforms (notably Windows).
+        # The elapsed time is added in UTC, as wall clock arithmetic in
+        # self.tz would be wrong across a DST change.
+        elapsed_ns = time.perf_counter_ns() - bm_data.start_counter
+        bm_data['finish_time'] = (
+            bm_data['start_time'].astimezone(timezone.utc) +
+            timedelta(microseconds=elapsed_ns / 1000)
+        ).astimezone(self.tz)
 
         # Terminate telemetry thread and gather results
         if hasattr(self, '_telemetry_thread'):
@@ -158,67 +286,153 @@ class MicroBench(object):
             self._telemetry_thread.join(timeout)
 
         # Run capturepost triggers
-        for method_name in dir(self):
-            if method_name.startswith('capturepost_'):
-                method = getattr(self, method_name)
-                if callable(method):
-                    method(bm_data)
+        for method in self._capturepost_methods:
+            method(bm_data)
 
     def pre_run_triggers(self, bm_data):
-        bm_data['_run_start'] = self._duration_counter()
+        bm_data.run_start = self._duration_counter()
 
     def post_run_triggers(self, bm_data):
-        bm_data['run_durations'].append(self._duration_counter() - bm_data['_run_start'])
+        bm_data['run_durations'].append(self._duration_counter() - bm_data.run_start)
 
     def capture_function_name(self, bm_data):
-        bm_data['function_name'] = bm_data['_func'].__name__
-
-    def _capture_package_version(self, bm_data, pkg, skip_if_none=False):
-        bm_data.setdefault('package_versions', {})
-        try:
-            ver = pkg.__version__
-        except AttributeError:
-            if skip_if_none:
-                return
-            ver = None
-        bm_data['package_versions'][pkg.__name__] = ver
+        bm_data['function_name'] = bm_data.func.__name__
+
+    def _set_pkg_version(self, pkg_versions, pkg, skip_if_none=False):
+        """ Store pkg's version in pkg_versions, keyed by package name """
+        # The cache keeps a reference to each module, so ids can't be reused
+        cached = self._pkg_version_cache.get(id(pkg))
+        if cached is not None and cached[0] is pkg:
+            ver = cached[1]
+        else:
+            ver = getattr(pkg, '__version__', None)
+            self._pkg_version_cache[id(pkg)] = (pkg, ver)
+        if ver is None and skip_if_none:
+            return
+        pkg_versions[pkg.__name__] = ver
 
     def to_json(self, bm_data):
-        bm_str = '{}'.format(json.dumps(bm_data,
-                                        cls=self._json_encoder))
+        if self._orjson:
+            try:
+                return orjson.dumps(bm_data, default=self._json_default,
+                                    option=_ORJSON_OPTIONS).decode('utf8')
+            except orjson.JSONEncodeError:
+                # orjson rejects some values the json module accepts, such
+                # as integers over 64 bits, so retry with the JSONEncoder
+                pass
+
+        return self._encoder.encode(bm_data)
+
+    def _to_json_line(self, bm_data):
+        """ Encode bm_data as a line of UTF-8 JSON, using to_json """
+        if self._orjson and not self._to_json_overridden:
+            # Use orjson's bytes directly, skipping the str round trip
+            try:
+                return orjson.dumps(
+                    bm_data, default=self._json_default,
+                    option=_ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+            except orjson.JSONEncodeError:
+                pass
 
-        return bm_str
+        return self.to_json(bm_data).encode('utf8') + b'\n'
 
     def output_result(self, bm_data):
         """ Output result to self.outfile as a line in JSON format """
-        bm_str = self.to_json(bm_data) + '\n'
-
-        # This should guarantee atomic writes on POSIX by setting O_APPEND
         if isinstance(self.outfile, str):
-            with open(self.outfile, 'a') as f:
-                f.write(bm_str)
+            self._buffer_output(self._to_json_line(bm_data))
         else:
             # Assume file-like object
-            self.outfile.write(bm_str)
+            self.outfile.write(self.to_json(bm_data))
+            self.outfile.write('\n')
+
+    def _buffer_output(self, *chunks):
+        """ Buffer the chunks making up one record, writing if needed """
+        with self._output_lock:
+            self._output_buffer.extend(chunks)
+            self._output_buffer_records += 1
+            if self._output_buffer_records < getattr(self, 'flush_every', 1):
+                if not self._flush_registered:
+                    atexit.register(self.flush)
+                    self._flush_registered = True
+                return
+            self._write_output(self._output_buffer)
+            self._output_buffer = []
+            self._output_buffer_records = 0
+
+    def _write_output(self, chunks):
+        if os.name == 'nt':
+            # Windows doesn't allow open files to be deleted or renamed, so
+            # don't hold the file open between writes
+            with open(self.outfile, 'ab') as fh:
+                fh.write(b''.join(chunks))
+            return
+
+        fh = self._outfile_handle
+        if fh is not None and not self._outfile_handle_current(fh):
+            fh.close()
+            fh = None
+        if fh is None:
+            # Append mode sets O_APPEND, which should guarantee atomic
+            # writes on POSIX. The file is unbuffered, so each batch of
+            # records is written with a single call.
+            fh = self._outfile_handle = open(self.outfile, 'ab', buffering=0)
+        fh.write(b''.join(chunks))
+
+    def _outfile_handle_current(self, fh):
+        """ Check fh still refers to the file at the outfile path
+
+        The file may have been deleted, moved or replaced (e.g. by log
+        rotation) since it was opened, in which case it must be reopened.
+        """
+        if fh.name != self.outfile:
+            return False
+        try:
+            path_stat = os.stat(self.outfile)
+        except OSError:
+            return False
+        fh_stat = os.fstat(fh.fileno())
+        return (path_stat.st_ino == fh_stat.st_ino and
+                path_stat.st_dev == fh_stat.st_dev)
+
+    def flush(self):
+        """ Write any buffered results to the output """
+        with self._output_lock:
+            if self._output_buffer:
+                self._write_output(self._output_buffer)
+                self._output_buffer = []
+                self._output_buffer_records = 0
+
+    def __del__(self):
+        fh = getattr(self, '_outfile_handle', None)
+        if fh is not None:
+            fh.close()
 
     def get_results(self):
+        pandas = _import_optional('pandas')
         if not pandas:
             raise ImportError('This fuctionality requires the "pandas" package')
 
+        self.flush()
+
         if hasattr(self.outfile, 'seek'):
             self.outfile.seek(0)
 
         return pandas.read_json(self.outfile, lines=True)
 
     def __call__(self, func):
+        # Resolve mixin membership once, at decoration time
+        use_line_profiler = isinstance(self, MBLineProfiler)
+        capture_return_value = isinstance(self, MBReturnValue)
+        line_profiler = _import_optional('line_profiler') \
+            if use_line_profiler else None
+
         def inner(*args, **kwargs):
-            bm_data = dict()
-            bm_data.update(self._bm_static)
-            bm_data['_func'] = func
-            bm_data['_args'] = args
-            bm_data['_kwargs'] = kwargs
+            bm_data = _BMData(self._bm_static)
+            bm_data.func = func
+            bm_data.args = args
+            bm_data.kwargs = kwargs
 
-            if isinstance(self, MBLineProfiler):
+            if use_line_profiler:
                 if not line_profiler:
                     raise ImportError('This functionality requires the '
                                       '"line_profiler" package')
@@ -229,7 +443,7 @@ class MicroBench(object):
             for _ in range(self.iterations):
                 self.pre_run_triggers(bm_data)
 
-                if isinstance(self, MBLineProfiler):
+                if use_line_profiler:
                     res = self._line_profiler.runcall(func, *args, **kwargs)
                 else:
                     res = func(*args, **kwargs)
@@ -237,7 +451,7 @@ class MicroBench(object):
 
             self.post_finish_triggers(bm_data)
 
-            if isinstance(self, MBReturnValue):
+            if capture_return_value:
                 try:
                     self.to_json(res)
                     bm_data['return_value'] = res
@@ -245,9 +459,12 @@ class MicroBench(object):
                     warnings.warn(f"Return value is not JSON encodable (type: {type(res)}). Extend JSONEncoder class to fix (see README).", JSONEncodeWarning)
                     bm_data['return_value'] = _UNENCODABLE_PLACEHOLDER_VALUE
 
-            # Delete any underscore-prefixed keys
-            bm_data = {k: v for k, v in bm_data.items()
-                       if not k.startswith('_')}
+            # Delete any underscore-prefixed keys, which capture methods can
+            # use for data that shouldn't be output
+            private_keys = [k for k in bm_data
+                            if isinstance(k, str) and k.startswith('_')]
+            for k in private_keys:
+                del bm_data[k]
 
             self.output_result(bm_data)
 
@@ -261,7 +478,7 @@ class MBFunctionCall(object):
     def capture_function_args_and_kwargs(self, bm_data):
         # Check all args are encodeable as JSON
         bm_data['args'] = []
-        for i, v in enumerate(bm_data['_args']):
+        for i, v in enumerate(bm_data.args):
             try:
                 bm_data['args'].append(self.to_json(v))
             except TypeError:
@@ -270,7 +487,7 @@ class MBFunctionCall(object):
 
         # Check all kwargs are encodeable as JSON
         bm_data['kwargs'] = {}
-        for k, v in bm_data['_kwargs'].items():
+        for k, v in bm_data.kwargs.items():
             try:
                 bm_data['kwargs'][k] = self.to_json(v)
             except TypeError:
@@ -303,67 +520,139 @@ class MBHostInfo(object):
 
 class MBGlobalPackages(object):
     """ Capture Python packages imported in global environment """
+    # Global namespace last scanned by this instance, with its number of
+    # globals at the time of the scan and the package versions found
+    _globals_pkg_cache = None
+
     def capture_functions(self, bm_data):
-        # Get globals of caller
-        caller_frame = inspect.currentframe().f_back.f_back.f_back
-        caller_globals = caller_frame.f_globals
+        # Use the benchmarked function's globals, falling back to those of
+        # the caller for callables without any (e.g. callable objects)
+        caller_globals = getattr(bm_data.func, '__globals__', None)
+        if caller_globals is None:
+            try:
+                caller_frame = sys._getframe(3)
+            except AttributeError:
+                # sys._getframe is a CPython implementation detail
+                caller_frame = inspect.currentframe().f_back.f_back.f_back
+            caller_globals = caller_frame.f_globals
+
+        # Compare by identity, as the namespace's id could be reused
+        cached = self._globals_pkg_cache
+        if cached is not None and cached[0] is caller_globals and \
+                cached[1] == len(caller_globals):
+            bm_data.setdefault('package_versions', {}).update(cached[2])
+            return
+
+        # Collect each module once, however many globals refer to it
+        modules = {}
+        seen_module_names = set()
         for g in caller_globals.values():
             if isinstance(g, types.ModuleType):
-                self._capture_package_version(bm_data, g, skip_if_none=True)
-            else:
-                try:
-                    module_name = g.__module__
-                except AttributeError:
-                    continue
+                modules[id(g)] = g
+                continue
+
+            try:
+                module_name = g.__module__.partition('.')[0]
+            except AttributeError:
+                # No __module__, or __module__ is None
+                continue
+
+            if module_name not in seen_module_names:
+                seen_module_names.add(module_name)
+                module = sys.modules.get(module_name)
+                if module is not None:
+                    modules[id(module)] = module
 
-                self._capture_package_version(
-                    bm_data,
-                    sys.modules[module_name.split('.')[0]],
-                    skip_if_none=True
-                )
+        pkg_versions = {}
+        for module in modules.values():
+            self._set_pkg_version(pkg_versions, module, skip_if_none=True)
+
+        self._globals_pkg_cache = (caller_globals, len(caller_globals),
+                                   pkg_versions)
+        bm_data.setdefault('package_versions', {}).update(pkg_versions)
 
 
 class MBCondaPackages(object):
     """ Capture conda packages; requires 'conda' package (pip install conda) """
     include_builds = True
     include_channels = False
+    # Parsed conda package lists, keyed by environment prefix, modification
+    # time of its conda-meta directory, and output options
+    _conda_versions_cache = {}
 
     def capture_conda_packages(self, bm_data):
-        if conda is None:
+        prefix = os.environ.get('CONDA_PREFIX', sys.prefix)
+        try:
+            meta_mtime = os.path.getmtime(os.path.join(prefix, 'conda-meta'))
+        except OSError:
+            meta_mtime = None
+        cache_key = (prefix, meta_mtime, self.include_builds,
+                     self.include_channels)
+
+        conda_versions = self._conda_versions_cache.get(cache_key)
+        if conda_versions is None:
+            conda_versions = self._list_conda_packages()
+            self._conda_versions_cache[cache_key] = conda_versions
+
+        bm_data['conda_versions'] = conda_versions.copy()
+
+    def _list_conda_packages(self):
+        conda_cli = _import_optional('conda.testing.conda_cli')
+        if conda_cli is None:
             # Use subprocess
             pkg_list = subprocess.check_output(['conda', 'list']).decode('utf8')
         else:
             # Use conda API
-            pkg_list, stderr, ret_code = conda.testing.conda_cli.run_command(
-                conda.testing.conda_cli.Commands.LIST)
+            pkg_list, stderr, ret_code = conda_cli.run_command(
+                conda_cli.Commands.LIST)
 
             if ret_code != 0 or stderr:
                 raise RuntimeError('Error running conda list: {}'.format(
                     stderr))
 
-        bm_data['conda_versions'] = {}
+        conda_versions = {}
 
         for pkg in pkg_list.splitlines():
             if pkg.startswith('#') or not pkg.strip():
                 continue
-            pkg_data = pkg.split()
+            pkg_data = pkg.split(None, 3)
             pkg_name = pkg_data[0]
             pkg_version = pkg_data[1]
             if self.include_builds:
                 pkg_version += pkg_data[2]
             if self.include_channels and len(pkg_data) == 4:
-                pkg_version += pkg_version + '(' + pkg_data[3] + ')'
-            bm_data['conda_versions'][pkg_name] = pkg_version
+                pkg_version += '(' + pkg_data[3] + ')'
+            conda_versions[pkg_name] = pkg_version
+
+        return conda_versions
 
 
 class MBInstalledPackages(object):
     """ Capture installed Python packages using importlib """
     capture_paths = False
+    # Installed package versions and paths, keyed by sys.path and
+    # capture_paths
+    _installed_pkg_cache = {}
 
     def capture_packages(self, bm_data):
-        bm_data['package_versions'] = {}
+        cache_key = (tuple(sys.path), self.capture_paths)
+        cached = self._installed_pkg_cache.get(cache_key)
+        if cached is None:
+            cached = self._installed_pkg_cache[cache_key] = \
+                self._list_installed_packages()
+        pkg_versions, pkg_paths = cached
+
+        bm_data['package_versions'] = pkg_versions.copy()
         if self.capture_paths:
-            bm_data['package_paths'] = {}
+            bm_data['package_paths'] = pkg_paths.copy()
+
+    def _list_installed_packages(self):
+        # Imported here, as importlib.metadata is slow to import and only
+        # needed on the first call
+        import importlib.metadata
+
+        pkg_versions = {}
+        pkg_paths = {}
 
         for pkg in importlib.metadata.distributions():
             try:
@@ -371,11 +660,14 @@ class MBInstalledPackages(object):
             except AttributeError:
                 # Python <3.9
                 pkg_name = pkg.metadata['Name']
-            bm_data['package_versions'][pkg_name] = pkg.version
-            if self.capture_paths:
-                bm_data['package_paths'][pkg_name] = os.path.dirname(
+            pkg_versions[pkg_name] = pkg.version
+            # files is None for distributions without a file manifest
+            if self.capture_paths and pkg.files:
+                pkg_paths[pkg_name] = os.path.dirname(
                     pkg.locate_file(pkg.files[0]))
 
+        return pkg_versions, pkg_paths
+
 
 class MBLineProfiler(object):
     """
@@ -388,8 +680,9 @@ class MBLineProfiler(object):
     """
     def capturepost_line_profile(self, bm_data):
         bm_data['line_profiler'] = base64.b64encode(
-            pickle.dumps(self._line_profiler.get_stats())
-        ).decode('utf8')
+            pickle.dumps(self._line_profiler.get_stats(),
+                         protocol=pickle.HIGHEST_PROTOCOL)
+        ).decode('ascii')
 
     @staticmethod
     def decode_line_profile(line_profile_pickled):
@@ -397,6 +690,10 @@ class MBLineProfiler(object):
 
     @classmethod
     def print_line_profile(self, line_profile_pickled, **kwargs):
+        line_profiler = _import_optional('line_profiler')
+        if not line_profiler:
+            raise ImportError('This functionality requires the '
+                              '"line_profiler" package')
         lp_data = self.decode_line_profile(line_profile_pickled)
         line_profiler.show_text(lp_data.timings, lp_data.unit, **kwargs)
 
@@ -404,22 +701,37 @@ class MBLineProfiler(object):
 class _NeedsPsUtil(object):
     @classmethod
     def _check_psutil(cls):
+        psutil = _import_optional('psutil')
         if not psutil:
             raise ImportError('psutil library needed')
+        return psutil
 
 
 class MBHostCpuCores(_NeedsPsUtil):
     """ Capture the number of logical CPU cores """
+    # Logical core count, looked up once per process
+    _cpu_cores = None
+
     def capture_cpu_cores(self, bm_data):
-        self._check_psutil()
-        bm_data['cpu_cores_logical'] = psutil.cpu_count()
+        cpu_cores = MBHostCpuCores._cpu_cores
+        if cpu_cores is None:
+            psutil = self._check_psutil()
+            cpu_cores = MBHostCpuCores._cpu_cores = psutil.cpu_count()
+        bm_data['cpu_cores_logical'] = cpu_cores
 
 
 class MBHostRamTotal(_NeedsPsUtil):
     """ Capture the total host RAM in bytes """
+    # Total RAM, looked up once per process
+    _total_ram = None
+
     def capture_total_ram(self, bm_data):
-        self._check_psutil()
-        bm_data['ram_total'] = psutil.virtual_memory().total
+        total_ram = MBHostRamTotal._total_ram
+        if total_ram is None:
+            psutil = self._check_psutil()
+            total_ram = MBHostRamTotal._total_ram = \
+                psutil.virtual_memory().total
+        bm_data['ram_total'] = total_ram
 
 
 class MBNvidiaSmi(object):
@@ -436,54 +748,79 @@ class MBNvidiaSmi(object):
     specify the nvidia_gpus attribute as a tuple of GPU IDs, which can be
     zero-based GPU indexes (can change between reboots, not recommended),
     GPU UUIDs, or PCI bus IDs.
+
+    Results are cached for nvidia_cache_ttl seconds (default: 10), to avoid
+    running nvidia-smi on every call. Set this to 0 to disable caching.
     """
 
     _nvidia_attributes_available = ('gpu_name', 'memory.total')
-    _nvidia_gpu_regex = re.compile(r'^[0-9A-Za-z\-:]+$')
+    _nvidia_attributes_required = frozenset(_nvidia_attributes_available)
+    _nvidia_gpu_id_chars = frozenset(string.ascii_letters + string.digits +
+                                     '-:')
+    # Results are reused for this many seconds; set to 0 to disable caching
+    nvidia_cache_ttl = 10
+    # Parsed nvidia-smi output, keyed by command, with the query time
+    _nvidia_smi_cache = {}
 
     def capture_nvidia(self, bm_data):
         if hasattr(self, 'nvidia_attributes'):
             nvidia_attributes = self.nvidia_attributes
-            unknown_attrs = set(self._nvidia_attributes_available).difference(
+            missing_attrs = self._nvidia_attributes_required.difference(
                 nvidia_attributes
             )
-            if unknown_attrs:
-                raise ValueError("Unknown nvidia_attributes: {}".format(
-                    ', '.join(unknown_attrs)
+            if missing_attrs:
+                raise ValueError("nvidia_attributes must include: {}".format(
+                    ', '.join(sorted(missing_attrs))
                 ))
         else:
             nvidia_attributes = self._nvidia_attributes_available
 
         if hasattr(self, 'nvidia_gpus'):
-            gpus = self.nvidia_gpus
+            gpus = [str(gpu) for gpu in self.nvidia_gpus]
             if not gpus:
                 raise ValueError('nvidia_gpus cannot be empty. Leave the '
                                  'attribute out to capture data for all GPUs')
             for gpu in gpus:
-                if not self._nvidia_gpu_regex.match(gpu):
+                if not gpu or not self._nvidia_gpu_id_chars.issuperset(gpu):
                     raise ValueError('nvidia_gpus must be a list of GPU indexes'
                                      '(zero-based), UUIDs, or PCI bus IDs')
         else:
             gpus = None
 
         # Construct the command
-        cmd = ['nvidia-smi', '--format=csv,noheader',
-               '--query-gpu=uuid,{}'.format(','.join(nvidia_attributes))]
+        cmd = ('nvidia-smi', '--format=csv,noheader',
+               '--query-gpu=uuid,{}'.format(','.join(nvidia_attributes)))
         if gpus:
-            cmd += ['-i', ','.join(gpus)]
+            cmd += ('-i', ','.join(gpus))
+
+        now = time.monotonic()
+        cached = self._nvidia_smi_cache.get(cmd)
+        if cached is not None and now - cached[0] < self.nvidia_cache_ttl:
+            nvidia_data = cached[1]
+        else:
+            nvidia_data = self._query_nvidia_smi(cmd, nvidia_attributes)
+            self._nvidia_smi_cache[cmd] = (now, nvidia_data)
+
+        for key, values in nvidia_data.items():
+            bm_data[key] = values.copy()
 
+    @staticmethod
+    def _query_nvidia_smi(cmd, nvidia_attributes):
         # Execute the command
         res = subprocess.check_output(cmd).decode('utf8')
 
         # Process results
+        nvidia_data = {}
         for gpu_line in res.split('\n'):
             if not gpu_line:
                 continue
             gpu_res = gpu_line.split(', ')
             for attr_idx, attr in enumerate(nvidia_attributes):
                 gpu_uuid = gpu_res[0]
-                bm_data.setdefault('nvidia_{}'.format(attr), {})[gpu_uuid] = \
-                    gpu_res[attr_idx + 1]
+                nvidia_data.setdefault('nvidia_{}'.format(attr), {})[
+                    gpu_uuid] = gpu_res[attr_idx + 1]
+
+        return nvidia_data
 
 
 class MicroBenchRedis(MicroBench):
@@ -494,24 +831,30 @@ class MicroBenchRedis(MicroBench):
         self.rclient = redis.StrictRedis(**self.redis_connection)
 
     def output_result(self, bm_data):
-        self.rclient.rpush(self.redis_key, self.to_json(bm_data))
+        self._buffer_output(self.to_json(bm_data))
+
+    def _write_output(self, chunks):
+        # Push a batch of results with a single RPUSH
+        self.rclient.rpush(self.redis_key, *chunks)
 
 
 class TelemetryThread(threading.Thread):
     def __init__(self, telem_fn, interval, slot, timezone, *args, **kwargs):
         super(TelemetryThread, self).__init__(*args, **kwargs)
+        # Don't keep the interpreter alive if the benchmarked function is
+        # interrupted before the thread is terminated
+        self.daemon = True
         self._terminate = threading.Event()
-        signal.signal(signal.SIGINT, self.terminate)
-        signal.signal(signal.SIGTERM, self.terminate)
         self._interval = interval
         self._telemetry = slot
         self._telem_fn = telem_fn
         self._tz = timezone
+        psutil = _import_optional('psutil')
         if not psutil:
             raise ImportError('Telemetry requires the "psutil" package')
         self.process = psutil.Process()
 
-    def terminate(self, signum=None, frame=None):
+    def terminate(self):
         self._terminate.set()
 
     def _get_telemetry(self):
@@ -1,7 +1,7 @@
 import difflib
 import json
 import re
-from itertools import zip_longest
+from itertools import repeat, zip_longest
 try:
     import html
 except ImportError:
@@ -9,7 +9,7 @@ except ImportError:
 
 
 def _mark_text(text):
-    return '<span style="color: red;">{}</span>'.format(text)
+    return f'<span style="color: red;">{text}</span>'
 
 
 def _mark_span(text):
@@ -20,17 +20,24 @@ def _markup_diff(a,
                  b,
                  mark=_mark_span,
                  default_mark=lambda x: x,
-                 isjunk=None):
+                 isjunk=None,
+                 seqmatcher=None):
     """Returns a and b with any differences processed by mark
 
-    Junk is ignored by the differ
+    Junk is ignored by the differ. An existing SequenceMatcher can be
+    passed as seqmatcher to reuse it across many calls; isjunk is then
+    ignored in favour of the matcher's own setting.
     """
-    seqmatcher = difflib.SequenceMatcher(isjunk=isjunk, a=a, b=b, autojunk=False)
+    if seqmatcher is None:
+        seqmatcher = difflib.SequenceMatcher(isjunk=isjunk, a=a, b=b,
+                                             autojunk=False)
+    else:
+        seqmatcher.set_seqs(a, b)
     out_a, out_b = [], []
     for tag, a0, a1, b0, b1 in seqmatcher.get_opcodes():
         markup = default_mark if tag == 'equal' else mark
-        out_a += markup(a[a0:a1])
-        out_b += markup(b[b0:b1])
+        out_a.extend(markup(a[a0:a1]))
+        out_b.extend(markup(b[b0:b1]))
     assert len(out_a) == len(a)
     assert len(out_b) == len(b)
     return out_a, out_b
@@ -41,23 +48,28 @@ def _align_seqs(a, b, fill=''):
     seqmatcher = difflib.SequenceMatcher(a=a, b=b, autojunk=False)
     for tag, a0, a1, b0, b1 in seqmatcher.get_opcodes():
         delta = (a1 - a0) - (b1 - b0)
-        out_a += a[a0:a1] + [fill] * max(-delta, 0)
-        out_b += b[b0:b1] + [fill] * max(delta, 0)
+        out_a.extend(a[a0:a1])
+        out_a.extend(repeat(fill, max(-delta, 0)))
+        out_b.extend(b[b0:b1])
+        out_b.extend(repeat(fill, max(delta, 0)))
     assert len(out_a) == len(out_b)
     return out_a, out_b
 
 
+_PANEL_TEMPLATE = '<pre style="margin-top:0;padding:0">%s</pre>'
+
+
 def _html_sidebyside(a, b):
     # Set the panel display
-    out = '<div style="display: grid;grid-template-columns: 1fr 1fr;grid-gap: 0;">'
-    # There's some CSS in Jupyter notebooks that makes the first pair unalign.
-    # This is a workaround
-    out += '<p></p><p></p>'
+    parts = ['<div style="display: grid;grid-template-columns: 1fr 1fr;grid-gap: 0;">',
+             # There's some CSS in Jupyter notebooks that makes the first
+             # pair unalign. This is a workaround
+             '<p></p><p></p>']
     for left, right in zip_longest(a, b, fillvalue=''):
-        out += '<pre style="margin-top:0;padding:0">{}</pre>'.format(left)
-        out += '<pre style="margin-top:0";padding:0>{}</pre>'.format(right)
-    out += '</div>'
-    return out
+        parts.append(_PANEL_TEMPLATE % left)
+        parts.append(_PANEL_TEMPLATE % right)
+    parts.append('</div>')
+    return ''.join(parts)
 
 
 def _html_diffs(a, b):
@@ -67,8 +79,11 @@ def _html_diffs(a, b):
     b = html.escape(b)
 
     out_a, out_b = [], []
+    # Reuse one matcher for the word-level diff of every line pair
+    seqmatcher = difflib.SequenceMatcher(autojunk=False)
     for sent_a, sent_b in zip(*_align_seqs(a.splitlines(), b.splitlines())):
-        mark_a, mark_b = _markup_diff(sent_a.split(' '), sent_b.split(' '))
+        mark_a, mark_b = _markup_diff(sent_a.split(' '), sent_b.split(' '),
+                                      seqmatcher=seqmatcher)
         out_a.append('&nbsp;'.join(mark_a))
         out_b.append('&nbsp;'.join(mark_b))
 
@@ -1,12 +1,22 @@
 from microbench import MicroBench, MBFunctionCall, MBPythonVersion, \
-    MBReturnValue, MBHostInfo, MBInstalledPackages, \
+    MBReturnValue, MBHostInfo, MBInstalledPackages, MBGlobalPackages, \
     JSONEncodeWarning, JSONEncoder, _UNENCODABLE_PLACEHOLDER_VALUE
 from microbench import __version__ as microbench_version
 import io
+import gc
+import json
+import os
+import numpy
 import pandas
 import datetime
 import warnings
+import threading
+import pytest
 from .globals_capture import globals_bench
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 
 def test_function():
@@ -177,3 +187,325 @@ def test_custom_jsonencoder():
 
     results = bench.get_results()
     assert results['return_value'][0] == str(obj)
+
+
+@pytest.mark.parametrize('to_path', [False, True])
+def test_custom_jsonencoder_datetime(tmp_path, to_path):
+    # datetime is encoded natively by orjson, so the custom encoder must
+    # be used instead for its default() to take effect
+    class CustomJSONEncoder(JSONEncoder):
+        def default(self, o):
+            if isinstance(o, datetime.datetime):
+                return 'CUSTOM'
+
+            return super().default(o)
+
+    outfile = str(tmp_path / 'results.jsonl') if to_path else None
+    bench = MicroBench(outfile=outfile, json_encoder=CustomJSONEncoder)
+
+    @bench
+    def noop():
+        pass
+
+    noop()
+    bench.flush()
+
+    if to_path:
+        with open(outfile) as f:
+            result = json_loads(f.readline())
+    else:
+        result = json_loads(bench.outfile.getvalue().splitlines()[0])
+    assert result['start_time'] == 'CUSTOM'
+    assert result['finish_time'] == 'CUSTOM'
+
+
+def test_finish_time_dst(monkeypatch):
+    zoneinfo = pytest.importorskip('zoneinfo')
+    try:
+        tz = zoneinfo.ZoneInfo('Europe/London')
+    except zoneinfo.ZoneInfoNotFoundError:
+        pytest.skip('time zone data not available')
+
+    import microbench
+
+    # Start 30 minutes before the clocks go forward, and run for an hour
+    class FixedDatetime(datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.datetime(2024, 3, 31, 0, 30, tzinfo=tz)
+
+    counter_ns = iter([0, 3600 * 10 ** 9])
+    monkeypatch.setattr(microbench, 'datetime', FixedDatetime)
+    monkeypatch.setattr(microbench.time, 'perf_counter_ns',
+                        lambda: next(counter_ns))
+
+    bench = MicroBench(tz=tz)
+
+    @bench
+    def noop():
+        pass
+
+    noop()
+
+    result = json_loads(bench.outfile.getvalue().splitlines()[0])
+    assert result['start_time'] == '2024-03-31T00:30:00+00:00'
+    assert result['finish_time'] == '2024-03-31T02:30:00+01:00'
+
+
+def test_stdlib_json_fallback(monkeypatch):
+    import microbench
+    monkeypatch.setattr(microbench, 'orjson', None)
+
+    class Bench(MicroBench, MBFunctionCall, MBReturnValue):
+        pass
+
+    bench = Bench()
+
+    @bench
+    def dummy(arg1):
+        return {'arg1': arg1}
+
+    dummy(1)
+
+    results = bench.get_results()
+    assert results['args'][0] == ['1']
+    assert results['return_value'][0] == {'arg1': 1}
+    assert results['timestamp_tz'][0] == 'UTC'
+
+
+@pytest.mark.parametrize('to_path', [False, True])
+def test_json_large_int(tmp_path, to_path):
+    # Integers over 64 bits aren't supported by orjson, so should fall back
+    # to the JSONEncoder
+    class Bench(MicroBench, MBFunctionCall, MBReturnValue):
+        pass
+
+    outfile = str(tmp_path / 'results.jsonl') if to_path else None
+    bench = Bench(outfile=outfile, run_id=2 ** 64)
+
+    @bench
+    def dummy(arg1):
+        return arg1 + 1
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', JSONEncodeWarning)
+        dummy(2 ** 64)
+
+    bench.flush()
+    # orjson.loads would parse these integers as floats
+    if to_path:
+        with open(outfile) as f:
+            result = json.loads(f.readline())
+    else:
+        result = json.loads(bench.outfile.getvalue().splitlines()[0])
+    assert result['run_id'] == 2 ** 64
+    assert result['args'] == [str(2 ** 64)]
+    assert result['return_value'] == 2 ** 64 + 1
+
+
+def test_underscore_keys_not_output():
+    class Bench(MicroBench):
+        def capture_scratch(self, bm_data):
+            bm_data['_handle'] = object()
+
+        def capturepost_scratch(self, bm_data):
+            bm_data['handle_type'] = type(bm_data['_handle']).__name__
+
+    bench = Bench()
+
+    @bench
+    def noop():
+        pass
+
+    noop()
+
+    result = json_loads(bench.outfile.getvalue().splitlines()[0])
+    assert '_handle' not in result
+    assert result['handle_type'] == 'object'
+
+
+def test_outfile_path(tmp_path):
+    outfile = str(tmp_path / 'results.jsonl')
+    bench = MicroBench(outfile=outfile)
+
+    @bench
+    def noop():
+        pass
+
+    for _ in range(2):
+        noop()
+
+    results = bench.get_results()
+    assert len(results) == 2
+    assert (results['function_name'] == 'noop').all()
+
+
+@pytest.mark.parametrize('to_path', [False, True])
+def test_to_json_override(tmp_path, to_path):
+    class Bench(MicroBench):
+        def to_json(self, bm_data):
+            return json.dumps({'overridden': True})
+
+    outfile = str(tmp_path / 'results.jsonl') if to_path else None
+    bench = Bench(outfile=outfile)
+
+    @bench
+    def noop():
+        pass
+
+    noop()
+
+    results = bench.get_results()
+    assert results.to_dict('records') == [{'overridden': True}]
+
+
+def test_outfile_flush_every(tmp_path):
+    outfile = tmp_path / 'results.jsonl'
+
+    class Bench(MicroBench):
+        flush_every = 2
+
+    bench = Bench(outfile=str(outfile))
+
+    @bench
+    def noop():
+        pass
+
+    noop()
+    assert not outfile.exists()
+
+    noop()
+    assert len(outfile.read_text().splitlines()) == 2
+
+    noop()
+    bench.flush()
+    assert len(outfile.read_text().splitlines()) == 3
+
+
+def test_outfile_deleted(tmp_path):
+    outfile = tmp_path / 'results.jsonl'
+    bench = MicroBench(outfile=str(outfile))
+
+    @bench
+    def noop():
+        pass
+
+    noop()
+    outfile.unlink()
+    noop()
+    assert len(outfile.read_text().splitlines()) == 1
+
+    # Replace the file, as log rotation might
+    outfile.rename(tmp_path / 'results.jsonl.1')
+    outfile.write_text('')
+    noop()
+    assert len(outfile.read_text().splitlines()) == 1
+    assert len(bench.get_results()) == 1
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork')
+def test_outfile_flush_every_fork(tmp_path):
+    outfile = tmp_path / 'results.jsonl'
+
+    class Bench(MicroBench):
+        flush_every = 10
+
+    bench = Bench(outfile=str(outfile))
+
+    @bench
+    def noop():
+        pass
+
+    noop()
+
+    pid = os.fork()
+    if pid == 0:
+        # The child shouldn't write the parent's buffered result
+        try:
+            noop()
+            bench.flush()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+
+    assert len(outfile.read_text().splitlines()) == 1
+    bench.flush()
+    assert len(outfile.read_text().splitlines()) == 2
+
+
+def test_telemetry_in_thread():
+    class TelemBench(MicroBench):
+        @staticmethod
+        def telemetry(process):
+            return process.memory_full_info()._asdict()
+
+    telem_bench = TelemBench()
+
+    @telem_bench
+    def noop():
+        pass
+
+    # Telemetry must work when the benchmarked function runs outside the
+    # main thread
+    thread = threading.Thread(target=noop)
+    thread.start()
+    thread.join()
+
+    results = telem_bench.get_results()
+    assert len(results['telemetry'][0]) > 0
+
+
+def test_env_vars_must_be_collection():
+    class Bench(MicroBench):
+        env_vars = ('HOME')
+
+    with pytest.raises(ValueError):
+        Bench()
+
+
+def test_capture_global_packages_cache():
+    class Bench(MicroBench, MBGlobalPackages):
+        pass
+
+    bench = Bench()
+
+    # Define the function in its own namespace, so we control its globals
+    namespace = {}
+    exec('def noop():\n    pass', namespace)
+    noop = bench(namespace['noop'])
+
+    noop()
+    noop()
+    # Adding a global should invalidate the cached scan
+    namespace['pandas'] = pandas
+    noop()
+
+    results = [json_loads(line) for line in
+               bench.outfile.getvalue().splitlines()]
+    assert 'pandas' not in results[0]['package_versions']
+    assert results[1]['package_versions'] == results[0]['package_versions']
+    assert results[2]['package_versions']['pandas'] == pandas.__version__
+
+
+def test_capture_global_packages_cache_freed_namespace():
+    class Bench(MicroBench, MBGlobalPackages):
+        pass
+
+    bench = Bench()
+
+    # A freed namespace's id can be reused by a new one of the same length,
+    # which must not be given the old namespace's packages
+    for i in range(50):
+        pkg = (pandas, numpy)[i % 2]
+        namespace = {pkg.__name__: pkg}
+        exec('def noop():\n    pass', namespace)
+        bench(namespace['noop'])()
+        del namespace
+        gc.collect()
+
+    results = [json_loads(line) for line in
+               bench.outfile.getvalue().splitlines()]
+    for i, result in enumerate(results):
+        pkg, other_pkg = (pandas, numpy) if i % 2 == 0 else (numpy, pandas)
+        assert result['package_versions'][pkg.__name__] == pkg.__version__
+        assert other_pkg.__name__ not in result['package_versions']
@@ -26,3 +26,37 @@ def test_nvidia():
     results = bench.get_results()
     assert 'nvidia_gpu_name' in results.columns
     assert 'nvidia_memory.total' in results.columns
+
+
+def test_nvidia_cached(monkeypatch):
+    calls = []
+
+    def check_output(cmd):
+        calls.append(cmd)
+        return b'GPU-abc123, Tesla T4, 15360 MiB\n'
+
+    monkeypatch.setattr(subprocess, 'check_output', check_output)
+    monkeypatch.setattr(MBNvidiaSmi, '_nvidia_smi_cache', {})
+
+    class Bench(MicroBench, MBNvidiaSmi):
+        nvidia_gpus = (0, 'GPU-abc123')
+
+    bench = Bench()
+
+    @bench
+    def test():
+        pass
+
+    test()
+    test()
+    assert len(calls) == 1
+    assert calls[0][-2:] == ('-i', '0,GPU-abc123')
+
+    results = bench.get_results()
+    assert (results['nvidia_gpu_name'] == {'GPU-abc123': 'Tesla T4'}).all()
+    assert (results['nvidia_memory.total'] ==
+            {'GPU-abc123': '15360 MiB'}).all()
+
+    bench.nvidia_cache_ttl = 0
+    test()
+    assert len(calls) == 2
@@ -1,5 +1,8 @@
 from microbench import MicroBench, MBHostCpuCores, MBHostRamTotal
-import pandas
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 
 def test_psutil():
@@ -14,6 +17,45 @@ def test_psutil():
 
     test_func()
 
-    results = mybench.get_results()
-    assert results['cpu_cores_logical'][0] >= 1
-    assert results['ram_total'][0] > 0
+    result = json_loads(mybench.outfile.getvalue().splitlines()[0])
+    assert result['cpu_cores_logical'] >= 1
+    assert result['ram_total'] > 0
+
+
+def test_psutil_cached(monkeypatch):
+    import psutil
+    calls = {'cpu_count': 0, 'virtual_memory': 0}
+    cpu_count = psutil.cpu_count
+    virtual_memory = psutil.virtual_memory
+
+    def counting_cpu_count(*args, **kwargs):
+        calls['cpu_count'] += 1
+        return cpu_count(*args, **kwargs)
+
+    def counting_virtual_memory(*args, **kwargs):
+        calls['virtual_memory'] += 1
+        return virtual_memory(*args, **kwargs)
+
+    monkeypatch.setattr(psutil, 'cpu_count', counting_cpu_count)
+    monkeypatch.setattr(psutil, 'virtual_memory', counting_virtual_memory)
+    monkeypatch.setattr(MBHostCpuCores, '_cpu_cores', None)
+    monkeypatch.setattr(MBHostRamTotal, '_total_ram', None)
+
+    class MyBench(MicroBench, MBHostCpuCores, MBHostRamTotal):
+        pass
+
+    mybench = MyBench()
+
+    @mybench
+    def test_func():
+        pass
+
+    test_func()
+    test_func()
+
+    assert calls == {'cpu_count': 1, 'virtual_memory': 1}
+    results = [json_loads(line) for line in
+               mybench.outfile.getvalue().splitlines()]
+    for result in results:
+        assert result['cpu_cores_logical'] == cpu_count()
+        assert result['ram_total'] == virtual_memory().total
@@ -0,0 +1,52 @@
+from microbench import MicroBenchRedis
+import sys
+import types
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+class FakeStrictRedis(object):
+    def __init__(self, **kwargs):
+        self.connection = kwargs
+        self.rpush_calls = []
+
+    def rpush(self, key, *values):
+        self.rpush_calls.append((key, values))
+
+
+def test_redis_flush_every(monkeypatch):
+    redis = types.ModuleType('redis')
+    redis.StrictRedis = FakeStrictRedis
+    monkeypatch.setitem(sys.modules, 'redis', redis)
+
+    class Bench(MicroBenchRedis):
+        redis_connection = {'host': 'localhost', 'port': 6379}
+        redis_key = 'microbench:test'
+        flush_every = 3
+
+    bench = Bench()
+    assert bench.rclient.connection == Bench.redis_connection
+
+    @bench
+    def noop():
+        pass
+
+    for _ in range(4):
+        noop()
+
+    # The first three results are pushed together
+    assert len(bench.rclient.rpush_calls) == 1
+    key, values = bench.rclient.rpush_calls[0]
+    assert key == 'microbench:test'
+    assert len(values) == 3
+    assert all(json_loads(v)['function_name'] == 'noop' for v in values)
+
+    # flush() pushes the remaining result
+    bench.flush()
+    assert len(bench.rclient.rpush_calls) == 2
+    assert len(bench.rclient.rpush_calls[1][1]) == 1
+
+    bench.flush()
+    assert len(bench.rclient.rpush_calls) == 2